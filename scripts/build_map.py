@@ -9,12 +9,17 @@ Uses Census tract geometries via the Census TIGERweb API.
 """
 
 import pandas as pd
+import numpy as np
 import geopandas as gpd
+import shapely
 import folium
 from folium.features import GeoJsonPopup, GeoJsonTooltip
-import json
 import os
+import pyogrio
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
@@ -34,52 +39,88 @@ STATES = {
     "DE": "10",
 }
 
+# Tracts are simplified in an equal-area planar CRS (CONUS Albers) so the
+# tolerance is in meters and consistent across latitudes
+PLANAR_CRS = "EPSG:5070"
+SIMPLIFY_TOLERANCE_M = 200.0
+
+
+def minify_html(html):
+    """Collapse whitespace in an inline HTML/CSS snippet before embedding it."""
+    html = re.sub(r"\s+", " ", html)
+    return re.sub(r">\s+<", "><", html).strip()
+
+
+def add_simplified_geometry(gdf):
+    """Attach a simplified copy of the tract geometry for display as geom_simplified."""
+    # Call GEOS directly on the projected GeometryArray, then return to the source CRS
+    projected = gdf.geometry.to_crs(PLANAR_CRS)
+    simplified = shapely.simplify(projected.array, SIMPLIFY_TOLERANCE_M, preserve_topology=True)
+    gdf["geom_simplified"] = gpd.GeoSeries(
+        simplified, index=gdf.index, crs=PLANAR_CRS
+    ).to_crs(gdf.crs)
+    return gdf
+
 
 def get_tract_geometries():
     """Download tract geometries from Census cartographic boundary shapefiles."""
-    cache_path = os.path.join(DATA_DIR, "raw", "tract_geometries.geojson")
+    # GeoParquet keeps geometries as WKB with columnar compression — much faster
+    # to reload than GeoJSON. The simplification CRS and tolerance are part of
+    # the filename, so changing either builds a fresh cache instead of reusing
+    # a stale geom_simplified.
+    crs_tag = PLANAR_CRS.replace(":", "").lower()
+    cache_path = os.path.join(
+        DATA_DIR, "raw", f"tract_geometries_{crs_tag}_{SIMPLIFY_TOLERANCE_M:g}m.parquet"
+    )
 
     if os.path.exists(cache_path):
         print("Loading cached tract geometries...")
-        return gpd.read_file(cache_path)
+        return gpd.read_parquet(cache_path)
 
     print("Downloading tract geometries from Census boundary files...")
-    all_gdf = []
-
-    for state_abbr, state_fips in STATES.items():
-        print(f"  {state_abbr}...")
-        # Census cartographic boundary files — 500k resolution (good balance of detail/size)
-        url = (
-            f"https://www2.census.gov/geo/tiger/GENZ2020/shp/"
-            f"cb_2020_us_tract_500k.zip"
-        )
-        # This is a national file — download once, filter by state
-        break  # Only need to download once
+
+    # Census cartographic boundary files — 500k resolution (good balance of detail/size)
+    # This is a national file — download once, filter by state
+    url = "https://www2.census.gov/geo/tiger/GENZ2020/shp/cb_2020_us_tract_500k.zip"
 
     # Download national tract boundaries
     zip_path = os.path.join(DATA_DIR, "raw", "cb_2020_us_tract_500k.zip")
     if not os.path.exists(zip_path):
         print("  Downloading national tract boundaries (this may take a minute)...")
-        r = requests.get(url, timeout=300, stream=True)
-        if r.status_code == 200:
-            with open(zip_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            print(f"  Downloaded {os.path.getsize(zip_path) / 1024 / 1024:.1f} MB")
-        else:
-            print(f"  ERROR: {r.status_code}")
-            return None
-
-    # Read and filter to our states
+        with requests.Session() as session:
+            # Retry transient failures with exponential backoff
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False,
+            )
+            session.mount("https://", HTTPAdapter(max_retries=retry))
+            r = session.get(url, timeout=300, stream=True)
+            if r.status_code == 200:
+                with open(zip_path, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=1024 * 1024):
+                        f.write(chunk)
+                print(f"  Downloaded {os.path.getsize(zip_path) / 1024 / 1024:.1f} MB")
+            else:
+                print(f"  ERROR: {r.status_code}")
+                return None
+
+    # Read and filter to our states — the STATEFP filter runs inside OGR,
+    # so tracts outside our states are never materialized
     print("  Reading shapefile...")
-    gdf = gpd.read_file(f"zip://{zip_path}")
-    state_fips_list = list(STATES.values())
-    gdf = gdf[gdf["STATEFP"].isin(state_fips_list)].copy()
-    gdf = gdf.rename(columns={"GEOID": "GEOID"})
+    state_fips_sql = ", ".join(f"'{fips}'" for fips in STATES.values())
+    gdf = pyogrio.read_dataframe(
+        f"/vsizip/{zip_path}",
+        where=f"STATEFP IN ({state_fips_sql})",
+    )
     print(f"  Filtered to {len(gdf)} tracts in our {len(STATES)} states")
 
-    # Save filtered cache
-    gdf.to_file(cache_path, driver="GeoJSON")
+    # Simplify once here so map rebuilds reuse the cached result
+    gdf = add_simplified_geometry(gdf)
+
+    # Save filtered cache — GeoParquet stores both geometry columns
+    gdf.to_parquet(cache_path)
     print(f"  Cached to {cache_path}")
 
     return gdf
@@ -89,82 +130,6 @@ def build_map():
     """Build the Folium choropleth map."""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    # Load scores
-    scores = pd.read_csv(
-        os.path.join(PROC_DIR, "tract_scores.csv"),
-        dtype={"GEOID": str, "county_geoid": str},
-    )
-    print(f"Loaded {len(scores)} scored tracts")
-
-    # Get geometries
-    geo = get_tract_geometries()
-
-    # Merge scores with geometries
-    merged = geo.merge(scores, on="GEOID", how="inner")
-    print(f"Merged: {len(merged)} tracts with geometry")
-
-    # Focus on high-opportunity tracts for performance
-    # Include Moderate and above (score > 50), plus a sample of below average
-    high_opp = merged[merged["opportunity_score"] >= 50].copy()
-    below_avg = merged[merged["opportunity_score"] < 50].sample(
-        n=min(2000, len(merged[merged["opportunity_score"] < 50])),
-        random_state=42,
-    ).copy()
-    map_data = pd.concat([high_opp, below_avg], ignore_index=True)
-    map_data = gpd.GeoDataFrame(map_data, geometry="geometry", crs="EPSG:4326")
-    print(f"Map tracts: {len(map_data)} ({len(high_opp)} high-opp + {len(below_avg)} sample)")
-
-    # Simplify geometries for performance
-    map_data["geometry"] = map_data["geometry"].simplify(0.002, preserve_topology=True)
-
-    # Round scores for display
-    score_cols = [
-        "opportunity_score", "score_supply_gap", "score_demand_signal",
-        "score_funding_tailwind", "score_build_feasibility",
-    ]
-    for col in score_cols:
-        map_data[col] = map_data[col].round(1)
-
-    # Round other display fields
-    map_data["median_hh_income"] = map_data["median_hh_income"].round(0)
-    map_data["pct_no_fiber"] = map_data["pct_no_fiber"].round(1)
-    map_data["pct_unserved_underserved"] = map_data["pct_unserved_underserved"].round(1)
-    map_data["pct_cellular_only"] = map_data["pct_cellular_only"].round(1)
-    map_data["pct_no_internet"] = map_data["pct_no_internet"].round(1)
-
-    # Fill NaN for display
-    map_data["median_hh_income"] = map_data["median_hh_income"].fillna(0)
-    map_data["rucc_code"] = map_data["rucc_code"].fillna(0).astype(int)
-
-    # Create map centered on the region (10 states: VA to MI/NY, DE to KY)
-    center_lat = 39.5
-    center_lon = -80.0
-    m = folium.Map(
-        location=[center_lat, center_lon],
-        zoom_start=5,
-        tiles="CartoDB positron",
-    )
-
-    # Color scale — light blue-gray at median, warm tones reserved for High tier (65+)
-    colormap = folium.LinearColormap(
-        colors=["#2166ac", "#92c5de", "#d0e1ef", "#fdae61", "#d73027", "#a50026"],
-        index=[20, 40, 52, 65, 73, 80],
-        vmin=20,
-        vmax=80,
-        caption="Fiber Opportunity Score",
-    )
-    colormap.add_to(m)
-
-    # Style function
-    def style_function(feature):
-        score = feature["properties"].get("opportunity_score", 0)
-        return {
-            "fillColor": colormap(score),
-            "color": "#333",
-            "weight": 0.3,
-            "fillOpacity": 0.7,
-        }
-
     # Tooltip fields
     tooltip_fields = [
         "GEOID",
@@ -207,10 +172,103 @@ def build_map():
         "RUCC Code:",
     ]
 
-    # Convert to JSON-safe format
-    map_json = json.loads(map_data[
-        ["geometry"] + list(set(tooltip_fields + popup_fields))
-    ].to_json())
+    # Only the displayed fields are carried through the merge and export
+    display_fields = list(dict.fromkeys(tooltip_fields + popup_fields))
+
+    # Load scores — only the displayed columns. Prefer the typed Parquet copy
+    # written by build_scoring_model.py; the committed CSV covers a fresh checkout.
+    parquet_path = os.path.join(PROC_DIR, "tract_scores.parquet")
+    if os.path.exists(parquet_path):
+        scores = pd.read_parquet(parquet_path, columns=display_fields)
+    else:
+        scores = pd.read_csv(
+            os.path.join(PROC_DIR, "tract_scores.csv"),
+            dtype={"GEOID": str},
+            usecols=display_fields,
+        )
+    print(f"Loaded {len(scores)} scored tracts")
+
+    # Get geometries
+    geo = get_tract_geometries()
+
+    # Merge scores with the precomputed simplified geometries — the TIGER
+    # attribute columns and full-resolution geometry are not needed for display
+    tract_geo = (
+        geo[["GEOID", "geom_simplified"]]
+        .set_geometry("geom_simplified")
+        .rename_geometry("geometry")
+    )
+    merged = tract_geo.merge(scores, on="GEOID", how="inner")
+    print(f"Merged: {len(merged)} tracts with geometry")
+
+    # Focus on high-opportunity tracts for performance
+    # Include Moderate and above (score > 50), plus a sample of below average
+    # Sample row positions first so the geometry column is copied only once
+    opportunity = merged["opportunity_score"].to_numpy()
+    high_idx = np.flatnonzero(opportunity >= 50)
+    below_idx = np.flatnonzero(opportunity < 50)
+    rng = np.random.default_rng(42)
+    sample_idx = rng.choice(below_idx, size=min(2000, below_idx.size), replace=False)
+    map_data = merged.iloc[np.concatenate([high_idx, sample_idx])].reset_index(drop=True)
+    map_data = gpd.GeoDataFrame(map_data, geometry="geometry", crs="EPSG:4326")
+    print(f"Map tracts: {len(map_data)} ({len(high_idx)} high-opp + {len(sample_idx)} sample)")
+
+    # Round scores and other display fields in a single pass
+    round_spec = {
+        "opportunity_score": 1,
+        "score_supply_gap": 1,
+        "score_demand_signal": 1,
+        "score_funding_tailwind": 1,
+        "score_build_feasibility": 1,
+        "median_hh_income": 0,
+        "pct_no_fiber": 1,
+        "pct_unserved_underserved": 1,
+        "pct_cellular_only": 1,
+        "pct_no_internet": 1,
+    }
+    map_data = map_data.round(round_spec)
+
+    # Fill NaN for display
+    map_data = map_data.fillna({"median_hh_income": 0, "rucc_code": 0})
+    map_data["rucc_code"] = map_data["rucc_code"].astype(int)
+
+    # Create map centered on the region (10 states: VA to MI/NY, DE to KY)
+    center_lat = 39.5
+    center_lon = -80.0
+    m = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=5,
+        tiles="CartoDB positron",
+    )
+
+    # Color scale — light blue-gray at median, warm tones reserved for High tier (65+)
+    colormap = folium.LinearColormap(
+        colors=["#2166ac", "#92c5de", "#d0e1ef", "#fdae61", "#d73027", "#a50026"],
+        index=[20, 40, 52, 65, 73, 80],
+        vmin=20,
+        vmax=80,
+        caption="Fiber Opportunity Score",
+    )
+    colormap.add_to(m)
+
+    # Precompute fill colors — rounded scores repeat heavily, so the colormap
+    # is evaluated once per distinct score rather than once per tract
+    unique_scores, score_idx = np.unique(map_data["opportunity_score"].to_numpy(), return_inverse=True)
+    unique_colors = np.array([colormap(score) for score in unique_scores])
+    map_data["fill_color"] = unique_colors[score_idx]
+
+    # Style function
+    def style_function(feature):
+        return {
+            "fillColor": feature["properties"]["fill_color"],
+            "color": "#333",
+            "weight": 0.3,
+            "fillOpacity": 0.7,
+        }
+
+    # Build the GeoJSON dict directly — Folium embeds dicts as-is, so there is
+    # no serialize/parse round trip before the HTML is written
+    map_json = map_data[["geometry", "fill_color"] + display_fields].to_geo_dict()
 
     # Add GeoJson layer
     geojson_layer = folium.GeoJson(
@@ -235,11 +293,11 @@ def build_map():
 
     # Add state border lines (dissolve ALL tract geometries by state FIPS for clean outlines)
     print("Building state border lines...")
-    geo_for_borders = geo.copy()
+    geo_for_borders = geo[["GEOID", "geometry"]].copy()
     geo_for_borders["state_fips"] = geo_for_borders["GEOID"].str[:2]
     state_borders = geo_for_borders.dissolve(by="state_fips").reset_index()
     state_borders["geometry"] = state_borders["geometry"].simplify(0.005, preserve_topology=True)
-    state_border_json = json.loads(state_borders[["geometry", "state_fips"]].to_json())
+    state_border_json = state_borders[["geometry", "state_fips"]].to_geo_dict()
     folium.GeoJson(
         state_border_json,
         name="State Borders",
@@ -263,7 +321,7 @@ def build_map():
     }
     </style>
     """
-    m.get_root().html.add_child(folium.Element(tooltip_suppress_css))
+    m.get_root().html.add_child(folium.Element(minify_html(tooltip_suppress_css)))
 
     # Add info legend / methodology panel
     legend_html = """
@@ -385,7 +443,7 @@ def build_map():
         </div>
     </div>
     """
-    m.get_root().html.add_child(folium.Element(legend_html))
+    m.get_root().html.add_child(folium.Element(minify_html(legend_html)))
 
     # Save
     outpath = os.path.join(OUTPUT_DIR, "fiber_opportunity_map.html")
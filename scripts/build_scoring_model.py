@@ -22,21 +22,29 @@ RAW_DIR = os.path.join(DATA_DIR, "raw")
 PROC_DIR = os.path.join(DATA_DIR, "processed")
 
 
+def read_raw(name):
+    """Read a pull script's output, preferring the typed Parquet copy over CSV."""
+    parquet_path = os.path.join(RAW_DIR, f"{name}.parquet")
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path)
+    return pd.read_csv(os.path.join(RAW_DIR, f"{name}.csv"), dtype={"GEOID": str})
+
+
 def load_and_merge():
     """Load all three datasets and merge on tract GEOID."""
     # ACS data
-    acs = pd.read_csv(os.path.join(RAW_DIR, "acs_2024_tracts.csv"), dtype={"GEOID": str})
+    acs = read_raw("acs_2024_tracts")
     print(f"ACS: {len(acs)} tracts")
 
     # FCC BDC data
-    fcc = pd.read_csv(os.path.join(RAW_DIR, "fcc_bdc_tracts.csv"), dtype={"GEOID": str})
+    fcc = read_raw("fcc_bdc_tracts")
     print(f"FCC: {len(fcc)} tracts")
 
     # RUCC data (county level — join via county GEOID)
     # National file in long format (3 rows per county: Population_2020, RUCC_2023, Description)
     rucc_long = pd.read_csv(os.path.join(RAW_DIR, "rucc_2023.csv"), encoding="latin-1")
     rucc = rucc_long.pivot_table(index=["FIPS", "State", "County_Name"], columns="Attribute", values="Value", aggfunc="first").reset_index()
-    rucc["county_geoid"] = rucc["FIPS"].astype(str).str.zfill(5)
+    rucc["county_geoid"] = np.char.zfill(rucc["FIPS"].astype(str).to_numpy(dtype=str), 5)
     rucc["RUCC_2023"] = pd.to_numeric(rucc["RUCC_2023"], errors="coerce")
     rucc["Population_2020"] = pd.to_numeric(rucc["Population_2020"], errors="coerce")
     rucc = rucc[["county_geoid", "RUCC_2023", "Population_2020", "Description"]].copy()
@@ -47,8 +55,9 @@ def load_and_merge():
     merged = acs.merge(fcc, on="GEOID", how="inner", suffixes=("_acs", "_fcc"))
     print(f"After ACS+FCC merge: {len(merged)} tracts")
 
-    # Add county GEOID for RUCC join (first 5 chars of tract GEOID)
-    merged["county_geoid"] = merged["GEOID"].str[:5]
+    # Add county GEOID for RUCC join (first 5 chars of tract GEOID) —
+    # casting to fixed-width U5 truncates in one NumPy pass
+    merged["county_geoid"] = merged["GEOID"].to_numpy(dtype="U5")
 
     # Merge RUCC
     merged = merged.merge(rucc, on="county_geoid", how="left")
@@ -63,145 +72,205 @@ def load_and_merge():
     # Clean Census NA codes
     merged["median_hh_income"] = merged["median_hh_income"].replace(-666666666, np.nan)
 
+    # Low-cardinality labels repeated across every tract — store as category codes
+    for col in ["StateAbbr", "CountyName", "rucc_description"]:
+        merged[col] = merged[col].astype("category")
+
     return merged
 
 
-def compute_derived_metrics(df):
-    """Compute derived metrics needed for scoring."""
-    # --- Supply side (FCC) ---
-    df["pct_unserved"] = df["UnservedBSLs"] / df["TotalBSLs"] * 100
-    df["pct_underserved"] = df["UnderservedBSLs"] / df["TotalBSLs"] * 100
-    df["pct_unserved_underserved"] = (df["UnservedBSLs"] + df["UnderservedBSLs"]) / df["TotalBSLs"] * 100
-    df["pct_fiber_unserved"] = df["UnservedBSLsFiber"] / df["TotalBSLs"] * 100
-    df["pct_no_fiber"] = (df["TotalBSLs"] - df["ServedBSLsFiber"]) / df["TotalBSLs"] * 100
-    df["pct_copper_served"] = df["ServedBSLsCopper"] / df["TotalBSLs"] * 100
-    df["has_fiber"] = (df["UniqueProvidersFiber"] > 0).astype(int)
-
-    # --- Demand side (ACS) ---
-    df["pct_no_internet"] = df["hh_no_internet"] / df["hh_total"] * 100
-    df["pct_cellular_only"] = df["hh_cellular_only"] / df["hh_total"] * 100
-    df["pct_broadband"] = df["hh_broadband_any"] / df["hh_total"] * 100
-    df["pct_cable_fiber_dsl"] = df["hh_cable_fiber_dsl"] / df["hh_total"] * 100
-
-    # Adoption gap: broadband is available but people aren't subscribing
-    # (served BSLs as % of total) - (% of households with broadband)
-    df["pct_served"] = df["ServedBSLs"] / df["TotalBSLs"] * 100
-    df["adoption_gap"] = df["pct_served"] - df["pct_broadband"]
-
-    # Education
-    df["pct_bachelors_plus"] = (
-        (df["edu_bachelors"] + df["edu_masters"] + df["edu_professional"] + df["edu_doctorate"])
-        / df["edu_total_25plus"].replace(0, np.nan)
-        * 100
-    )
+def safe_divide(numerator, denominator):
+    """Elementwise numerator / denominator, NaN where the denominator is zero."""
+    out = np.full(len(numerator), np.nan)
+    return np.divide(numerator, denominator, out=out, where=denominator != 0)
 
-    # Employment
-    df["unemployment_rate"] = (
-        df["emp_unemployed"] / df["emp_civilian_labor"].replace(0, np.nan) * 100
-    )
 
-    # Demographics
-    df["pct_minority"] = (
-        (df["race_total"] - df["race_nh_white"]) / df["race_total"].replace(0, np.nan) * 100
-    )
+def compute_derived_metrics(df):
+    """Compute derived metrics needed for scoring.
 
-    # Density — households per BSL (proxy for housing density)
-    df["hh_per_bsl"] = df["hh_total"] / df["TotalBSLs"]
+    Source columns are pulled out as NumPy arrays once and every derived
+    column is attached in a single assign() call.
+    """
+    def col(name):
+        return df[name].to_numpy(dtype=np.float64)
+
+    total_bsls = col("TotalBSLs")
+    unserved = col("UnservedBSLs")
+    underserved = col("UnderservedBSLs")
+    hh_total = col("hh_total")
+
+    # Shared by the adoption gap below
+    pct_served = col("ServedBSLs") / total_bsls * 100
+    pct_broadband = col("hh_broadband_any") / hh_total * 100
+
+    derived = {
+        # --- Supply side (FCC) ---
+        "pct_unserved": unserved / total_bsls * 100,
+        "pct_underserved": underserved / total_bsls * 100,
+        "pct_unserved_underserved": (unserved + underserved) / total_bsls * 100,
+        "pct_fiber_unserved": col("UnservedBSLsFiber") / total_bsls * 100,
+        "pct_no_fiber": (total_bsls - col("ServedBSLsFiber")) / total_bsls * 100,
+        "pct_copper_served": col("ServedBSLsCopper") / total_bsls * 100,
+        "has_fiber": (col("UniqueProvidersFiber") > 0).astype(int),
+
+        # --- Demand side (ACS) ---
+        "pct_no_internet": col("hh_no_internet") / hh_total * 100,
+        "pct_cellular_only": col("hh_cellular_only") / hh_total * 100,
+        "pct_broadband": pct_broadband,
+        "pct_cable_fiber_dsl": col("hh_cable_fiber_dsl") / hh_total * 100,
+
+        # Adoption gap: broadband is available but people aren't subscribing
+        # (served BSLs as % of total) - (% of households with broadband)
+        "pct_served": pct_served,
+        "adoption_gap": pct_served - pct_broadband,
+
+        # Education
+        "pct_bachelors_plus": safe_divide(
+            col("edu_bachelors") + col("edu_masters") + col("edu_professional") + col("edu_doctorate"),
+            col("edu_total_25plus"),
+        ) * 100,
+
+        # Employment
+        "unemployment_rate": safe_divide(col("emp_unemployed"), col("emp_civilian_labor")) * 100,
+
+        # Demographics
+        "pct_minority": safe_divide(
+            col("race_total") - col("race_nh_white"), col("race_total")
+        ) * 100,
+
+        # Density — households per BSL (proxy for housing density)
+        "hh_per_bsl": hh_total / total_bsls,
+
+        # No computer
+        "pct_no_computer": safe_divide(col("comp_no_computer"), col("comp_total_hh")) * 100,
+    }
 
-    # No computer
-    df["pct_no_computer"] = df["comp_no_computer"] / df["comp_total_hh"].replace(0, np.nan) * 100
+    return df.assign(**derived)
+
+
+# Inputs converted to percentile scores in a single rank call.
+# RANK_ASCENDING: higher values get higher scores.
+# RANK_DESCENDING: lower values get higher scores (inverted).
+RANK_ASCENDING = [
+    "pct_no_fiber",
+    "pct_unserved_underserved",
+    "pct_copper_served",
+    "median_hh_income",
+    "TotalBSLs",
+    "pct_cellular_only",
+    "adoption_gap",
+    "total_population",
+    "UnservedBSLs",
+    "pct_unserved",
+    "UnderservedBSLs",
+]
+RANK_DESCENDING = ["UniqueProvidersFiber", "UniqueProviders"]
+
+# Supply Gap weights — higher = more opportunity (less fiber, more unserved, more copper dependency)
+SUPPLY_GAP_WEIGHTS = {
+    "UniqueProvidersFiber": 0.30,      # No fiber providers = big opportunity
+    "pct_no_fiber": 0.25,              # High % of BSLs without fiber service
+    "pct_unserved_underserved": 0.20,  # High % unserved + underserved
+    "pct_copper_served": 0.15,         # Heavy copper/DSL dependency (aging infrastructure)
+    "UniqueProviders": 0.10,           # Few total providers (less competition)
+}
+
+# Demand Signal weights — higher = stronger demand signals
+DEMAND_SIGNAL_WEIGHTS = {
+    "median_hh_income": 0.30,   # Income — need enough to afford $60-80/mo service
+    "TotalBSLs": 0.25,          # Household density — enough rooftops (BSLs) to justify the build
+    "pct_cellular_only": 0.20,  # Cellular-only rate — people WANT internet but can't get wired service
+    "adoption_gap": 0.15,       # Adoption gap — broadband exists but people aren't on it
+    "total_population": 0.10,   # Population
+}
+
+# Funding Tailwind weights — higher = more BEAD-eligible locations
+FUNDING_TAILWIND_WEIGHTS = {
+    "UnservedBSLs": 0.30,              # Raw count of unserved BSLs (BEAD targets these first)
+    "pct_unserved": 0.30,              # Unserved as % of total (concentration)
+    "UnderservedBSLs": 0.20,           # Underserved count (BEAD second priority)
+    "pct_unserved_underserved": 0.20,  # Combined unserved + underserved percentage
+}
+
+# Final composite weights across the four component scores
+COMPOSITE_WEIGHTS = {
+    "score_supply_gap": 0.40,
+    "score_demand_signal": 0.30,
+    "score_funding_tailwind": 0.15,
+    "score_build_feasibility": 0.15,
+}
+
+
+def fill_income(df):
+    """Median household income as a float array, missing values filled by the dataset median."""
+    income = df["median_hh_income"]
+    return income.fillna(income.median()).to_numpy(dtype=np.float64)
+
+
+def percentile_scores(df):
+    """Convert every scoring input to 0-100 percentile scores.
+
+    All columns are ranked together in one DataFrame.rank call. Income is
+    median-filled and the adoption gap clipped at zero before ranking.
+    Every column shares the same rank options, so there is nothing to gain
+    from fanning columns out to a thread pool — the single call ranks the
+    full ten-state dataset in tens of milliseconds.
+    """
+    inputs = df[RANK_ASCENDING + RANK_DESCENDING].copy()
+    inputs["median_hh_income"] = fill_income(df)
+    inputs["adoption_gap"] = inputs["adoption_gap"].clip(lower=0)
 
-    return df
+    ranks = inputs.rank(pct=True, na_option="bottom")
+    ranks[RANK_DESCENDING] = 1 - ranks[RANK_DESCENDING]
+    return ranks * 100
 
 
-def percentile_score(series, ascending=True):
-    """Convert a series to 0-100 percentile scores.
-    ascending=True means higher values get higher scores.
-    ascending=False means lower values get higher scores (inverted).
+def weighted_sum(scores, weights):
+    """Combine percentile-score columns using a {column: weight} dict.
+
+    Accumulates in dict order so results match the written-out weighted sum exactly.
     """
-    ranks = series.rank(pct=True, na_option="bottom")
-    if not ascending:
-        ranks = 1 - ranks
-    return ranks * 100
+    values = scores[list(weights)].to_numpy(dtype=np.float64)
+    total = np.zeros(len(values))
+    term = np.empty(len(values))
+    for i, weight in enumerate(weights.values()):
+        np.multiply(values[:, i], weight, out=term)
+        total += term
+    return total
 
 
-def score_supply_gap(df):
+def score_supply_gap(ranks):
     """
     Supply Gap Score (0-100): How much room is there for fiber?
     Higher = more opportunity (less fiber, more unserved, more copper dependency).
     """
-    # No fiber providers = big opportunity
-    s1 = percentile_score(df["UniqueProvidersFiber"], ascending=False)
-
-    # High % of BSLs without fiber service
-    s2 = percentile_score(df["pct_no_fiber"], ascending=True)
-
-    # High % unserved + underserved
-    s3 = percentile_score(df["pct_unserved_underserved"], ascending=True)
+    return weighted_sum(ranks, SUPPLY_GAP_WEIGHTS)
 
-    # Heavy copper/DSL dependency (aging infrastructure)
-    s4 = percentile_score(df["pct_copper_served"], ascending=True)
 
-    # Few total providers (less competition)
-    s5 = percentile_score(df["UniqueProviders"], ascending=False)
-
-    # Weighted combination
-    supply_score = (s1 * 0.30 + s2 * 0.25 + s3 * 0.20 + s4 * 0.15 + s5 * 0.10)
-    return supply_score
-
-
-def score_demand_signal(df):
+def score_demand_signal(df, ranks):
     """
     Demand Signal Score (0-100): Will people buy fiber if you build it?
     Higher = stronger demand signals.
     """
-    # Income — need enough to afford $60-80/mo service
-    # Sweet spot is middle-to-upper income, not too low (can't afford), not too high (already served)
-    # Use percentile but cap the very low end
-    income_filled = df["median_hh_income"].fillna(df["median_hh_income"].median())
-    s1 = percentile_score(income_filled, ascending=True)
-    # Penalize very low income (below $30k) — harder to sustain subscriptions
-    low_income_penalty = np.where(income_filled < 30000, 0.5, 1.0)
-    s1 = s1 * low_income_penalty
-
-    # Household density — enough rooftops (BSLs) to justify the build
-    s2 = percentile_score(df["TotalBSLs"], ascending=True)
-
-    # Cellular-only rate — people WANT internet but can't get wired service
-    s3 = percentile_score(df["pct_cellular_only"], ascending=True)
+    # Income sweet spot is middle-to-upper income, not too low (can't afford),
+    # not too high (already served). Penalize very low income (below $30k) —
+    # harder to sustain subscriptions
+    demand = ranks[list(DEMAND_SIGNAL_WEIGHTS)].copy()
+    low_income_penalty = 1.0 - 0.5 * (fill_income(df) < 30000)
+    demand["median_hh_income"] = demand["median_hh_income"] * low_income_penalty
 
-    # Adoption gap — broadband exists but people aren't on it (marketing opportunity)
-    s4 = percentile_score(df["adoption_gap"].clip(lower=0), ascending=True)
+    return weighted_sum(demand, DEMAND_SIGNAL_WEIGHTS)
 
-    # Population
-    s5 = percentile_score(df["total_population"], ascending=True)
 
-    demand_score = (s1 * 0.30 + s2 * 0.25 + s3 * 0.20 + s4 * 0.15 + s5 * 0.10)
-    return demand_score
-
-
-def score_funding_tailwind(df):
+def score_funding_tailwind(ranks):
     """
     Funding Tailwind Score (0-100): Is there BEAD money available?
     Higher = more BEAD-eligible locations (unserved/underserved).
     """
-    # Raw count of unserved BSLs (BEAD targets these first)
-    s1 = percentile_score(df["UnservedBSLs"], ascending=True)
-
-    # Unserved as % of total (concentration)
-    s2 = percentile_score(df["pct_unserved"], ascending=True)
-
-    # Underserved count (BEAD second priority)
-    s3 = percentile_score(df["UnderservedBSLs"], ascending=True)
+    return weighted_sum(ranks, FUNDING_TAILWIND_WEIGHTS)
 
-    # Combined unserved + underserved percentage
-    s4 = percentile_score(df["pct_unserved_underserved"], ascending=True)
 
-    funding_score = (s1 * 0.30 + s2 * 0.30 + s3 * 0.20 + s4 * 0.20)
-    return funding_score
-
-
-def score_build_feasibility(df):
+def score_build_feasibility(df, ranks):
     """
     Build Feasibility Score (0-100): Can you actually build here profitably?
     Sweet spot: not too sparse (unprofitable), not too dense (incumbents own it).
@@ -211,41 +280,37 @@ def score_build_feasibility(df):
     4-6 = Suburban/small town (sweet spot — higher score)
     7-9 = Very rural (sparse, expensive — moderate score)
     """
-    # RUCC sweet spot scoring
-    rucc_map = {
-        1: 20,   # Big metro — Comcast/Verizon territory
-        2: 35,   # Medium metro — still competitive
-        3: 55,   # Small metro — some opportunity
-        4: 85,   # Adjacent to metro, 20k+ pop — sweet spot
-        5: 75,   # Not adjacent, 20k+ pop — good
-        6: 90,   # Adjacent to metro, 5-20k pop — best sweet spot
-        7: 70,   # Not adjacent, 5-20k pop — decent
-        8: 60,   # Adjacent, <5k pop — getting sparse
-        9: 40,   # Not adjacent, <5k pop — very rural, expensive
-    }
-    s1 = df["rucc_code"].map(rucc_map).fillna(50)
+    # RUCC sweet spot scoring — lookup table indexed by RUCC code (0 = missing)
+    rucc_lut = np.array([
+        50,  # 0: Missing RUCC code — neutral
+        20,  # 1: Big metro — Comcast/Verizon territory
+        35,  # 2: Medium metro — still competitive
+        55,  # 3: Small metro — some opportunity
+        85,  # 4: Adjacent to metro, 20k+ pop — sweet spot
+        75,  # 5: Not adjacent, 20k+ pop — good
+        90,  # 6: Adjacent to metro, 5-20k pop — best sweet spot
+        70,  # 7: Not adjacent, 5-20k pop — decent
+        60,  # 8: Adjacent, <5k pop — getting sparse
+        40,  # 9: Not adjacent, <5k pop — very rural, expensive
+    ])
+    s1 = rucc_lut[df["rucc_code"].fillna(0).to_numpy(dtype=np.int64)]
 
     # BSL density — sweet spot is moderate
     # Too few BSLs = unprofitable, too many = already served
-    bsl_count = df["TotalBSLs"]
     # Score peaks around the 40th-70th percentile
-    bsl_pctile = bsl_count.rank(pct=True)
-    s2 = np.where(
-        bsl_pctile < 0.1, 20,       # Very sparse
-        np.where(
-            bsl_pctile < 0.3, 50,    # Sparse
-            np.where(
-                bsl_pctile < 0.7, 85, # Sweet spot
-                np.where(
-                    bsl_pctile < 0.9, 60,  # Dense
-                    30                      # Very dense (urban core)
-                )
-            )
-        )
-    )
+    bsl_band_edges = np.array([10, 30, 70, 90])
+    bsl_band_scores = np.array([
+        20,  # < 10th: Very sparse
+        50,  # 10th-30th: Sparse
+        85,  # 30th-70th: Sweet spot
+        60,  # 70th-90th: Dense
+        30,  # > 90th: Very dense (urban core)
+    ])
+    bsl_pctile = ranks["TotalBSLs"].to_numpy()
+    s2 = bsl_band_scores[np.searchsorted(bsl_band_edges, bsl_pctile, side="right")]
 
     # Fewer existing providers = easier market entry
-    s3 = percentile_score(df["UniqueProviders"], ascending=False)
+    s3 = ranks["UniqueProviders"]
 
     feasibility_score = (s1 * 0.40 + s2 * 0.35 + s3 * 0.25)
     return feasibility_score
@@ -253,27 +318,29 @@ def score_build_feasibility(df):
 
 def build_composite_score(df):
     """Build the final composite opportunity score."""
-    df["score_supply_gap"] = score_supply_gap(df)
-    df["score_demand_signal"] = score_demand_signal(df)
-    df["score_funding_tailwind"] = score_funding_tailwind(df)
-    df["score_build_feasibility"] = score_build_feasibility(df)
+    ranks = percentile_scores(df)
+
+    df["score_supply_gap"] = score_supply_gap(ranks)
+    df["score_demand_signal"] = score_demand_signal(df, ranks)
+    df["score_funding_tailwind"] = score_funding_tailwind(ranks)
+    df["score_build_feasibility"] = score_build_feasibility(df, ranks)
 
     # Weighted composite
-    df["opportunity_score"] = (
-        df["score_supply_gap"] * 0.40
-        + df["score_demand_signal"] * 0.30
-        + df["score_funding_tailwind"] * 0.15
-        + df["score_build_feasibility"] * 0.15
-    )
+    df["opportunity_score"] = weighted_sum(df, COMPOSITE_WEIGHTS)
 
     # Rank
     df["opportunity_rank"] = df["opportunity_score"].rank(ascending=False).astype(int)
 
-    # Tier labels
-    df["opportunity_tier"] = pd.cut(
-        df["opportunity_score"],
-        bins=[0, 30, 50, 65, 80, 100],
-        labels=["Low", "Below Average", "Moderate", "High", "Very High"],
+    # Tier labels — right-closed bins (0, 30], (30, 50], (50, 65], (65, 80], (80, 100];
+    # scores outside (0, 100] get no tier
+    score = df["opportunity_score"].to_numpy()
+    tier_edges = np.array([30, 50, 65, 80])
+    tier_codes = np.searchsorted(tier_edges, score, side="left")
+    tier_codes = np.where((score > 0) & (score <= 100), tier_codes, -1)
+    df["opportunity_tier"] = pd.Categorical.from_codes(
+        tier_codes,
+        categories=["Low", "Below Average", "Moderate", "High", "Very High"],
+        ordered=True,
     )
 
     return df
@@ -306,7 +373,7 @@ def main():
     print(f"\nTier Counts:")
     print(df["opportunity_tier"].value_counts().sort_index())
     print(f"\nTier Counts by State:")
-    tier_by_state = df.groupby(["StateAbbr", "opportunity_tier"]).size().unstack(fill_value=0)
+    tier_by_state = df.groupby(["StateAbbr", "opportunity_tier"], observed=False).size().unstack(fill_value=0)
     print(tier_by_state)
 
     # Top 20 tracts
@@ -320,19 +387,19 @@ def main():
             "rucc_code", "opportunity_score", "opportunity_rank",
         ]
     ]
-    for _, row in top20.iterrows():
+    for row in top20.itertuples(index=False):
         print(
-            f"  #{row['opportunity_rank']:>5d} | {row['StateAbbr']} {row['CountyName']:>25s} | "
-            f"Pop {row['total_population']:>6,.0f} | BSLs {row['TotalBSLs']:>5,d} | "
-            f"Income ${row['median_hh_income']:>7,.0f} | Fiber provs {row['UniqueProvidersFiber']:>2.0f} | "
-            f"No fiber {row['pct_no_fiber']:>5.1f}% | Unsrv+Undrsrv {row['pct_unserved_underserved']:>5.1f}% | "
-            f"Score {row['opportunity_score']:.1f}"
+            f"  #{row.opportunity_rank:>5d} | {row.StateAbbr} {row.CountyName:>25s} | "
+            f"Pop {row.total_population:>6,.0f} | BSLs {row.TotalBSLs:>5,d} | "
+            f"Income ${row.median_hh_income:>7,.0f} | Fiber provs {row.UniqueProvidersFiber:>2.0f} | "
+            f"No fiber {row.pct_no_fiber:>5.1f}% | Unsrv+Undrsrv {row.pct_unserved_underserved:>5.1f}% | "
+            f"Score {row.opportunity_score:.1f}"
         )
 
     # Top counties (aggregate)
     print(f"\n--- Top 20 Opportunity Counties (avg tract score) ---")
     county_scores = (
-        df.groupby(["StateAbbr", "CountyName", "county_geoid", "rucc_code"])
+        df.groupby(["StateAbbr", "CountyName", "county_geoid", "rucc_code"], observed=True)
         .agg(
             avg_score=("opportunity_score", "mean"),
             max_score=("opportunity_score", "max"),
@@ -345,20 +412,25 @@ def main():
         .reset_index()
         .sort_values("avg_score", ascending=False)
     )
-    for _, row in county_scores.head(20).iterrows():
+    for row in county_scores.head(20).itertuples(index=False):
         print(
-            f"  {row['StateAbbr']} {row['CountyName']:>25s} (RUCC {row['rucc_code']:.0f}) | "
-            f"Tracts {row['tract_count']:>3d} | BSLs {row['total_bsls']:>7,d} | "
-            f"Unserved {row['total_unserved']:>5,d} | "
-            f"Avg income ${row['avg_income']:>7,.0f} | "
-            f"No fiber {row['avg_no_fiber_pct']:>5.1f}% | "
-            f"Avg score {row['avg_score']:.1f}"
+            f"  {row.StateAbbr} {row.CountyName:>25s} (RUCC {row.rucc_code:.0f}) | "
+            f"Tracts {row.tract_count:>3d} | BSLs {row.total_bsls:>7,d} | "
+            f"Unserved {row.total_unserved:>5,d} | "
+            f"Avg income ${row.avg_income:>7,.0f} | "
+            f"No fiber {row.avg_no_fiber_pct:>5.1f}% | "
+            f"Avg score {row.avg_score:.1f}"
         )
 
-    # Save scored data
+    # Save scored data — Parquet for the map build (typed, columnar),
+    # CSV for human inspection
+    parquet_outpath = os.path.join(PROC_DIR, "tract_scores.parquet")
+    df.to_parquet(parquet_outpath, index=False)
+    print(f"\nSaved tract scores to {parquet_outpath}")
+
     outpath = os.path.join(PROC_DIR, "tract_scores.csv")
     df.to_csv(outpath, index=False)
-    print(f"\nSaved tract scores to {outpath}")
+    print(f"Saved tract scores to {outpath}")
 
     county_outpath = os.path.join(PROC_DIR, "county_scores.csv")
     county_scores.to_csv(county_outpath, index=False)
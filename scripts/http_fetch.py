@@ -0,0 +1,123 @@
+"""
+Shared async HTTP helper for the pull scripts.
+
+fetch_json() GETs a JSON endpoint with retries (exponential backoff, or the
+wait the server's rate-limit headers ask for) and an on-disk response cache
+under data/.http_cache/ so re-runs during model iteration skip the live API.
+"""
+
+import aiohttp
+import asyncio
+import orjson
+import hashlib
+from email.utils import parsedate_to_datetime
+import os
+import time
+
+# Transient HTTP statuses retried with exponential backoff (0.5s, 1s, 2s),
+# or after the wait the server's Retry-After / X-RateLimit-Reset asks for
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+# Upper bound on a server-requested wait so a bad header can't stall the pull
+MAX_RETRY_DELAY = 60.0
+
+# On-disk response cache so repeated runs during model iteration don't
+# re-pull from the live API; entries older than a day are refetched
+HTTP_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", ".http_cache")
+CACHE_EXPIRE_SECONDS = 86400
+
+
+def cache_path(base_url, params):
+    """Cache file for a request, keyed by endpoint + sorted query params."""
+    key = orjson.dumps([base_url, sorted(params.items())])
+    return os.path.join(HTTP_CACHE_DIR, hashlib.sha256(key).hexdigest() + ".json")
+
+
+def read_cache(path):
+    """Return the cached body for path, or None if missing or expired."""
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_EXPIRE_SECONDS:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def write_cache(path, body):
+    """Store a response body — written to a temp file first so an interrupted
+    run never leaves a truncated entry behind."""
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+
+
+def retry_delay(headers, default):
+    """Seconds to wait before retrying, taken from the server's rate-limit
+    headers when it sends them, else the exponential backoff default."""
+    retry_after = headers.get("Retry-After")
+    if retry_after is not None:
+        # Either delta-seconds or an HTTP date
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = default
+        return min(max(delay, 0.0), MAX_RETRY_DELAY)
+
+    reset = headers.get("X-RateLimit-Reset")
+    if headers.get("X-RateLimit-Remaining") == "0" and reset is not None:
+        try:
+            reset = float(reset)
+        except ValueError:
+            return default
+        # Reset is an epoch timestamp on most APIs, seconds-from-now on some
+        delay = reset - time.time() if reset > 1e9 else reset
+        return min(max(delay, 0.0), MAX_RETRY_DELAY)
+
+    return default
+
+
+async def fetch_json(session, base_url, params, label, cache_key_params=None, is_cacheable=None):
+    """GET base_url and parse the JSON body, retrying transient failures.
+
+    Successful responses are served from / stored in HTTP_CACHE_DIR.
+    cache_key_params(params) picks the params that identify a cache entry
+    (default: all of them); is_cacheable(data) can veto storing a parsed
+    response. Returns None after printing the error if the request
+    ultimately fails.
+    """
+    key_params = cache_key_params(params) if cache_key_params else params
+    path = cache_path(base_url, key_params)
+    cached = read_cache(path)
+    if cached is not None:
+        return orjson.loads(cached)
+
+    for attempt in range(MAX_RETRIES + 1):
+        retries_left = attempt < MAX_RETRIES
+        delay = BACKOFF_FACTOR * 2 ** attempt
+        try:
+            async with session.get(base_url, params=params) as r:
+                if r.status == 200:
+                    body = await r.read()
+                    data = orjson.loads(body)
+                    if is_cacheable is None or is_cacheable(data):
+                        write_cache(path, body)
+                    return data
+                if r.status not in RETRY_STATUSES or not retries_left:
+                    text = await r.text()
+                    print(f"  ERROR {label}: HTTP {r.status} - {text[:200]}")
+                    return None
+                # Throttled — wait as long as the server asks, not a fixed delay
+                delay = retry_delay(r.headers, delay)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if not retries_left:
+                print(f"  ERROR {label}: {e!r}")
+                return None
+
+        await asyncio.sleep(delay)
@@ -3,15 +3,24 @@ Pull Census ACS 2020-2024 5-year data for fiber opportunity scoring model.
 Ten states: VA, KY, MD, PA, OH, NY, WV, MI, NJ, DE
 Tract-level data for: broadband subscriptions, income, education, employment,
 race/ethnicity, population/housing density.
+
+Set CENSUS_API_KEY in the environment to send a Census API key with the
+request — keyless calls work but get a much lower daily quota.
 """
 
-import requests
+import aiohttp
+import asyncio
 import pandas as pd
-import time
-import json
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.compute as pc
 import os
 
+from http_fetch import fetch_json
+
 BASE_URL = "https://api.census.gov/data/2024/acs/acs5"
+CENSUS_KEY = os.environ.get("CENSUS_API_KEY")
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "raw")
 
 # State FIPS codes
@@ -27,6 +36,9 @@ STATES = {
     "NJ": "34",
     "DE": "10",
 }
+FIPS_TO_ABBR = {fips: abbr for abbr, fips in STATES.items()}
+# Fixed category set for state_abbr — counts come straight off the codes
+STATE_ABBR_DTYPE = pd.CategoricalDtype(list(STATES))
 
 # Variables to pull — grouped by topic
 # Each tuple: (variable_code, friendly_name)
@@ -75,80 +87,139 @@ VARIABLES = {
     "B28001_011E": "comp_no_computer",
 }
 
+# Column order of the API response: NAME, the requested variables, then the
+# geography columns. The friendly header is assigned directly on construction.
+GEO_COLUMNS = ["state", "county", "tract"]
+API_HEADER = ["NAME"] + list(VARIABLES) + GEO_COLUMNS
+FRIENDLY_HEADER = ["NAME"] + list(VARIABLES.values()) + GEO_COLUMNS
 
-def pull_state_tracts(state_abbr, state_fips):
-    """Pull all variables for all tracts in a state."""
-    var_codes = list(VARIABLES.keys())
 
-    # Census API limit is ~50 variables per request — we're under that
-    var_string = ",".join(var_codes)
+def cache_key_params(params):
+    """Leave the API key out of the cache key so keyed and keyless runs share entries."""
+    return {k: v for k, v in params.items() if k != "key"}
 
-    params = {
-        "get": f"NAME,{var_string}",
-        "for": "tract:*",
-        "in": f"state:{state_fips}",
-    }
 
-    r = requests.get(BASE_URL, params=params)
+# Placeholder strings the API uses for suppressed / unavailable estimates
+MISSING_SENTINELS = pa.array(["-", "", "null", "*"])
 
-    if r.status_code != 200:
-        print(f"  ERROR {state_abbr}: {r.status_code} - {r.text[:200]}")
-        return None
 
-    data = r.json()
-    header = data[0]
-    rows = data[1:]
+def to_numeric(values):
+    """Cast an object array of API strings to numbers with Arrow's C++ kernels.
 
-    df = pd.DataFrame(rows, columns=header)
+    Sentinel strings are masked to null first. int64 is tried before float64
+    so integer-only columns keep the dtype pd.to_numeric would infer (nulls
+    still come back as float64 NaN). Columns neither cast can parse fall back
+    to pd.to_numeric(errors="coerce").
+    """
+    arr = pa.array(values, type=pa.string(), from_pandas=True)
+    arr = pc.if_else(pc.is_in(arr, value_set=MISSING_SENTINELS), pa.scalar(None, pa.string()), arr)
+    for target in (pa.int64(), pa.float64()):
+        try:
+            return pc.cast(arr, target).to_numpy(zero_copy_only=False)
+        except pa.ArrowInvalid:
+            continue
+    return pd.to_numeric(values, errors="coerce")
 
-    # Build GEOID from state + county + tract
-    df["GEOID"] = df["state"] + df["county"] + df["tract"]
-    df["state_abbr"] = state_abbr
 
-    # Convert numeric columns
-    for var_code in var_codes:
-        df[var_code] = pd.to_numeric(df[var_code], errors="coerce")
+async def pull_tracts(session):
+    """Pull all variables for all tracts in every state with a single query.
+
+    Returns the raw API (header, rows) — DataFrame construction and type
+    conversion happen once in main().
+    """
+    # Census API limit is ~50 variables per request — we're under that
+    var_string = ",".join(VARIABLES)
 
-    # Rename to friendly names
-    df = df.rename(columns=VARIABLES)
+    # The API accepts a comma-separated state list, so one request covers all states
+    params = {
+        "get": f"NAME,{var_string}",
+        "for": "tract:*",
+        "in": "state:" + ",".join(STATES.values()),
+    }
+    if CENSUS_KEY:
+        params["key"] = CENSUS_KEY
+
+    data = await fetch_json(session, BASE_URL, params, "ACS", cache_key_params=cache_key_params)
+    if data is None:
+        return None
 
-    return df
+    return data[0], data[1:]
 
 
-def main():
+async def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    all_dfs = []
+    print(f"Pulling {len(STATES)} states: {', '.join(STATES)}...")
+    async with aiohttp.ClientSession(
+        # One response carries every tract in every state — bound connect and
+        # per-read stalls rather than the whole transfer
+        timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=120),
+        # JSON compresses well; aiohttp decodes brotli when the brotli package is installed
+        headers={"Accept-Encoding": "br, gzip"},
+    ) as session:
+        result = await pull_tracts(session)
+
+    if result is None:
+        print("  FAILED — no output written")
+        return None
+    header, rows = result
 
-    for state_abbr, state_fips in STATES.items():
-        print(f"Pulling {state_abbr} (FIPS {state_fips})...")
-        df = pull_state_tracts(state_abbr, state_fips)
+    if header != API_HEADER:
+        print(f"  ERROR ACS: unexpected response header {header}")
+        print("  FAILED — no output written")
+        return None
 
-        if df is not None:
-            print(f"  {len(df)} tracts")
-            all_dfs.append(df)
+    # Friendly names go on at construction — no rename pass over the columns
+    combined = pd.DataFrame(rows, columns=FRIENDLY_HEADER)
 
-        time.sleep(0.5)  # Be nice to the API
+    # Build GEOID from state + county + tract — fixed-width U arrays let NumPy
+    # concatenate in contiguous buffers rather than per-row Python strings
+    combined["GEOID"] = np.char.add(
+        np.char.add(
+            combined["state"].to_numpy(dtype="U2"),
+            combined["county"].to_numpy(dtype="U3"),
+        ),
+        combined["tract"].to_numpy(dtype="U6"),
+    )
+    combined["state_abbr"] = combined["state"].map(FIPS_TO_ABBR).astype(STATE_ABBR_DTYPE)
 
-    # Combine all states
-    combined = pd.concat(all_dfs, ignore_index=True)
+    # Convert numeric columns
+    for name in VARIABLES.values():
+        combined[name] = to_numeric(combined[name].to_numpy(dtype=object))
     print(f"\nTotal tracts: {len(combined)}")
     print(f"By state:")
-    print(combined["state_abbr"].value_counts().sort_index())
+    # Categorical value_counts is a bincount over the codes, already in STATES order
+    print(combined["state_abbr"].value_counts(sort=False))
 
-    # Save
-    outpath = os.path.join(OUTPUT_DIR, "acs_2024_tracts.csv")
-    combined.to_csv(outpath, index=False)
-    print(f"\nSaved to {outpath}")
+    # Save — Parquet keeps the numeric dtypes for the scoring model,
+    # CSV for human inspection
+    parquet_outpath = os.path.join(OUTPUT_DIR, "acs_2024_tracts.parquet")
+    combined.to_parquet(parquet_outpath, engine="pyarrow", compression="zstd", index=False)
+    print(f"\nSaved to {parquet_outpath}")
 
-    # Quick sanity check
+    outpath = os.path.join(OUTPUT_DIR, "acs_2024_tracts.csv")
+    # Arrow's C++ CSV writer rather than pandas' per-row string formatting
+    pa_csv.write_csv(
+        pa.Table.from_pandas(combined, preserve_index=False),
+        outpath,
+        write_options=pa_csv.WriteOptions(batch_size=64_000),
+    )
+    print(f"Saved to {outpath}")
+
+    # Quick sanity check — one agg call so each column is scanned once
+    stats = combined.agg({
+        "median_hh_income": ["min", "max"],
+        "hh_total": ["count"],
+        "total_population": ["sum"],
+    })
     print(f"\nSanity check:")
-    print(f"  Median HH income range: ${combined['median_hh_income'].min():,.0f} - ${combined['median_hh_income'].max():,.0f}")
-    print(f"  Tracts with no internet data: {combined['hh_total'].isna().sum()}")
-    print(f"  Total population: {combined['total_population'].sum():,.0f}")
+    print(f"  Median HH income range: ${stats.at['min', 'median_hh_income']:,.0f} - ${stats.at['max', 'median_hh_income']:,.0f}")
+    print(f"  Tracts with no internet data: {len(combined) - int(stats.at['count', 'hh_total'])}")
+    print(f"  Total population: {stats.at['sum', 'total_population']:,.0f}")
 
     return combined
 
 
 if __name__ == "__main__":
-    main()
+    if asyncio.run(main()) is None:
+        raise SystemExit(1)
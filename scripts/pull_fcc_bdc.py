@@ -9,11 +9,15 @@ Layer 9 = BDC Records for Tracts (per-provider detail)
 We only need Layer 2 for the scoring model.
 """
 
-import requests
-import pandas as pd
-import time
+import aiohttp
+import asyncio
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from tqdm.asyncio import tqdm_asyncio
 import os
 
+from http_fetch import fetch_json
+
 BASE_URL = (
     "https://services.arcgis.com/jIL9msH9OI208GCb/arcgis/rest/services/"
     "FCC_Broadband_Data_Collection_June_2022/FeatureServer/2/query"
@@ -21,7 +25,10 @@ BASE_URL = (
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "raw")
 
-# State FIPS codes — used to filter by GEOID prefix
+# Max simultaneous requests to the ArcGIS host
+MAX_CONCURRENT_REQUESTS = 8
+
+# States to pull — abbreviations feed the StateAbbr IN (...) filter
 STATES = {
     "VA": "51",
     "KY": "21",
@@ -72,90 +79,179 @@ FIELDS = [
     "UniqueProvidersLTFW",
 ]
 
+# Text fields — everything else in FIELDS is an integer count
+STRING_FIELDS = {"GEOID", "CountyName", "StateName", "StateAbbr", "CountyGEOID"}
 
-def pull_state_tracts(state_abbr, state_fips):
-    """Pull all tracts for a state from the ArcGIS Feature Service."""
-    all_features = []
-    offset = 0
-    batch_size = 2000  # max records per request
+# Explicit Arrow schema so pages skip per-column dtype inference; int64
+# columns holding nulls still come out of to_pandas() as float64
+FIELD_SCHEMA = pa.schema([
+    (name, pa.string() if name in STRING_FIELDS else pa.int64())
+    for name in FIELDS
+])
+
+
+def is_cacheable(data):
+    """ArcGIS reports query errors with HTTP 200 — don't cache those."""
+    return "error" not in data
 
-    while True:
-        params = {
-            "where": f"StateAbbr='{state_abbr}'",
-            "outFields": ",".join(FIELDS),
-            "returnGeometry": "false",
-            "f": "json",
-            "resultOffset": offset,
-            "resultRecordCount": batch_size,
-        }
 
-        r = requests.get(BASE_URL, params=params, timeout=30)
+async def count_records(session, semaphore, where):
+    """Ask the Feature Service how many records match a where clause."""
+    params = {
+        "where": where,
+        "returnCountOnly": "true",
+        "f": "json",
+    }
 
-        if r.status_code != 200:
-            print(f"  ERROR: HTTP {r.status_code}")
-            break
+    async with semaphore:
+        data = await fetch_json(session, BASE_URL, params, f"({where})", is_cacheable=is_cacheable)
 
-        data = r.json()
+    if data is None:
+        return None
+    if "error" in data:
+        print(f"  ERROR ({where}): {data['error']}")
+        return None
 
-        if "error" in data:
-            print(f"  ERROR: {data['error']}")
-            break
+    return data.get("count")
 
-        features = data.get("features", [])
-        if not features:
-            break
 
-        all_features.extend([f["attributes"] for f in features])
-        offset += len(features)
+async def fetch_page(session, semaphore, where, offset, batch_size):
+    """Fetch one page of tract attributes starting at offset.
 
-        # Check if we got all records
-        if len(features) < batch_size:
-            break
+    Returns the page as a pyarrow RecordBatch typed by FIELD_SCHEMA, or None
+    if the request failed.
+    """
+    params = {
+        "where": where,
+        "outFields": ",".join(FIELDS),
+        "returnGeometry": "false",
+        "f": "json",
+        # Stable ordering so concurrently fetched offset pages don't overlap
+        "orderByFields": "GEOID",
+        "resultOffset": str(offset),
+        "resultRecordCount": str(batch_size),
+    }
 
-        time.sleep(0.3)
+    async with semaphore:
+        data = await fetch_json(
+            session, BASE_URL, params, f"({where}, offset {offset})", is_cacheable=is_cacheable
+        )
 
-    if all_features:
-        return pd.DataFrame(all_features)
-    return None
+    if data is None:
+        return None
+    if "error" in data:
+        print(f"  ERROR ({where}, offset {offset}): {data['error']}")
+        return None
 
+    # Convert to columnar as soon as the page lands, so the attribute dicts
+    # are freed per page rather than held for the whole pull
+    return pa.RecordBatch.from_pylist(
+        [f["attributes"] for f in data.get("features", [])], schema=FIELD_SCHEMA
+    )
+
+
+async def pull_tracts(session, semaphore):
+    """Pull all tracts for every state from the ArcGIS Feature Service.
+
+    One IN-list query covers all states; the record count is fetched first
+    so every page can be requested at once. Returns a pyarrow Table typed
+    by FIELD_SCHEMA, or None unless every counted record came back.
+    """
+    state_list = ", ".join(f"'{state_abbr}'" for state_abbr in STATES)
+    where = f"StateAbbr IN ({state_list})"
+    batch_size = 2000  # max records per request
 
-def main():
+    total = await count_records(session, semaphore, where)
+    if not total:
+        return None
+
+    pages = await tqdm_asyncio.gather(
+        *[
+            fetch_page(session, semaphore, where, offset, batch_size)
+            for offset in range(0, total, batch_size)
+        ],
+        desc="FCC pages",
+        unit="page",
+    )
+    failed_pages = sum(page is None for page in pages)
+    batches = [page for page in pages if page is not None and page.num_rows]
+    table = pa.Table.from_batches(batches, schema=FIELD_SCHEMA)
+
+    # A partial pull would be written out and silently scored — also catches
+    # a service whose maxRecordCount is below batch_size, which would skip
+    # records between the fixed offsets
+    if failed_pages or table.num_rows != total:
+        print(f"  ERROR: got {table.num_rows} of {total} tracts ({failed_pages} failed pages)")
+        return None
+
+    return table
+
+
+async def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    all_dfs = []
+    # All pages are fetched concurrently — the semaphore caps in-flight
+    # requests to the ArcGIS host so queued pages don't sit in the
+    # connection pool eating into their timeout
+    print(f"Pulling {len(STATES)} states: {', '.join(STATES)}...")
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENT_REQUESTS),
+        timeout=aiohttp.ClientTimeout(total=30),
+        # JSON compresses well; aiohttp decodes brotli when the brotli package is installed
+        headers={"Accept-Encoding": "br, gzip"},
+    ) as session:
+        table = await pull_tracts(session, semaphore)
+
+    if table is None:
+        print("  FAILED — no output written")
+        return None
 
-    for state_abbr, state_fips in STATES.items():
-        print(f"Pulling {state_abbr}...")
-        df = pull_state_tracts(state_abbr, state_fips)
+    # One Arrow -> pandas conversion for every state
+    combined = table.to_pandas()
 
-        if df is not None:
-            print(f"  {len(df)} tracts")
-            all_dfs.append(df)
-        else:
-            print(f"  FAILED")
+    # Low-cardinality labels repeated on every tract — category stores small
+    # integer codes plus one dictionary, and Parquet keeps it dictionary-encoded
+    for col in ["StateAbbr", "StateName", "CountyName", "CountyGEOID"]:
+        combined[col] = combined[col].astype("category")
 
-        time.sleep(0.5)
+    state_counts = combined["StateAbbr"].value_counts()
+    for state_abbr in STATES:
+        print(f"  {state_abbr}: {state_counts.get(state_abbr, 0)} tracts")
 
-    combined = pd.concat(all_dfs, ignore_index=True)
     print(f"\nTotal tracts: {len(combined)}")
-    print(f"By state:")
-    print(combined["StateAbbr"].value_counts().sort_index())
-
-    # Quick stats
-    print(f"\nTotal BSLs: {combined['TotalBSLs'].sum():,.0f}")
-    print(f"Unserved BSLs: {combined['UnservedBSLs'].sum():,.0f}")
-    print(f"Underserved BSLs: {combined['UnderservedBSLs'].sum():,.0f}")
-    print(f"Served BSLs: {combined['ServedBSLs'].sum():,.0f}")
-    print(f"\nFiber served BSLs: {combined['ServedBSLsFiber'].sum():,.0f}")
-    print(f"Fiber unserved BSLs: {combined['UnservedBSLsFiber'].sum():,.0f}")
+
+    # Quick stats — one sum() over the BSL columns instead of one per print
+    bsl_totals = combined[[
+        "TotalBSLs", "UnservedBSLs", "UnderservedBSLs", "ServedBSLs",
+        "ServedBSLsFiber", "UnservedBSLsFiber",
+    ]].sum()
+    print(f"\nTotal BSLs: {bsl_totals['TotalBSLs']:,.0f}")
+    print(f"Unserved BSLs: {bsl_totals['UnservedBSLs']:,.0f}")
+    print(f"Underserved BSLs: {bsl_totals['UnderservedBSLs']:,.0f}")
+    print(f"Served BSLs: {bsl_totals['ServedBSLs']:,.0f}")
+    print(f"\nFiber served BSLs: {bsl_totals['ServedBSLsFiber']:,.0f}")
+    print(f"Fiber unserved BSLs: {bsl_totals['UnservedBSLsFiber']:,.0f}")
     print(f"Tracts with zero fiber providers: {(combined['UniqueProvidersFiber'] == 0).sum()}")
 
+    # Save — Parquet keeps the numeric dtypes for the scoring model,
+    # CSV for human inspection
+    parquet_outpath = os.path.join(OUTPUT_DIR, "fcc_bdc_tracts.parquet")
+    combined.to_parquet(parquet_outpath, engine="pyarrow", compression="zstd", index=False)
+    print(f"\nSaved to {parquet_outpath}")
+
     outpath = os.path.join(OUTPUT_DIR, "fcc_bdc_tracts.csv")
-    combined.to_csv(outpath, index=False)
-    print(f"\nSaved to {outpath}")
+    # Arrow's C++ CSV writer rather than pandas' per-row string formatting
+    pa_csv.write_csv(
+        pa.Table.from_pandas(combined, preserve_index=False),
+        outpath,
+        write_options=pa_csv.WriteOptions(batch_size=64_000),
+    )
+    print(f"Saved to {outpath}")
 
     return combined
 
 
 if __name__ == "__main__":
-    main()
+    if asyncio.run(main()) is None:
+        raise SystemExit(1)